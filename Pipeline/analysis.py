@@ -3,6 +3,7 @@ import numpy as np
 import re
 import matplotlib.pyplot as plt
 import seaborn as sns
+from export_writer import export_table
 
 # 1) Load & normalize column names
 df = pd.read_csv("drafted_combine_participants.csv")
@@ -108,7 +109,7 @@ def summarize(grp, label):
 succ_sum = summarize(success, "Success_Profile")
 risk_sum = summarize(risk,    "Risk_Profile")
 profiles = pd.concat([succ_sum, risk_sum])
-profiles.to_csv("profile_combine_summary.csv")
+export_table(profiles, "profile_combine_summary.csv", index=True)
 print("✅ profile_combine_summary.csv saved")
 
 # 9) Plot profiles
@@ -124,5 +125,5 @@ print("✅ archetype_signatures.png saved")
 export_cols = [KEY,"Career_Arc","Perf_Tier","Seasons_Played","Avg_PPG","Injury_Count","Avg_Injury_Days"] + valid_metrics
 export_cols = [c for c in export_cols if c in df.columns]
 player_sum = df[export_cols].drop_duplicates()
-player_sum.to_csv("player_level_analysis.csv", index=False)
+export_table(player_sum, "player_level_analysis.csv")
 print("✅ player_level_analysis.csv saved")
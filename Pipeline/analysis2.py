@@ -3,24 +3,27 @@ import re
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 import numpy as np
+import os
+import sys
+from export_writer import export_table, export_outputs
+import feature_store
 
-# --- 1. Load the Raw Data ---
-# Make sure these files are in the same directory as your script
-try:
-    drafted_df = pd.read_csv('drafted_combine_participants.csv')
-    injury_df = pd.read_csv('injury_data_2009_2023new.csv')
-    print("Files loaded successfully.")
-except FileNotFoundError:
-    print("Error: Make sure 'drafted_combine_participants.csv' and 'injury_data_2009_2023new.csv' are in the correct directory.")
-    exit()
-
+SOURCE_FILES = ['drafted_combine_participants.csv', 'injury_data_2009_2023new.csv']
+STORE_DIR = 'feature_store'
+MERGED_EXPORT = 'merged_combine_injury_data.csv'
 
-# --- 2. Clean and Prepare the Data ---
-print("Cleaning and preparing data...")
+# Define the features (combine metrics) and the targets the feature store must hold.
+# Every other numeric column is stored too, so any of them can be modelled without re-parsing.
+features = [
+    'WINGSPAN', 'STANDING REACH', 'WEIGHT (LBS)',
+    'Standing Vertical Leap', 'Lane Agility Time', 'Three Quarter Sprint',
+    'Max Vertical Leap', 'BODY FAT %', 'Shuttle Run',
+    'Max Bench Press', 'HAND WIDTH (inches)', 'HAND LENGTH (inches)'
+]
+targets = ['W', 'PTS', 'Seasons_Played']
+# Target to model, e.g. `python analysis2.py PTS` (defaults to 'W' for Win Shares)
+target = sys.argv[1] if len(sys.argv) > 1 else 'W'
 
-# Clean column names by stripping whitespace
-drafted_df.columns = drafted_df.columns.str.strip()
-injury_df.columns = ['ID', 'Date', 'Team', 'Relinquished', 'Player', 'Notes'] # Rename injury data columns
 
 # --- Robustly convert height columns ---
 def convert_height_to_inches(height_str):
@@ -41,57 +44,108 @@ def clean_and_convert_to_numeric(series):
         return pd.to_numeric(series, errors='coerce')
     return series
 
-# Apply cleaning functions
-drafted_df['HEIGHT W/O SHOES'] = drafted_df['HEIGHT W/O SHOES'].apply(convert_height_to_inches)
-drafted_df['HEIGHT W/ SHOES'] = drafted_df['HEIGHT W/ SHOES'].apply(convert_height_to_inches)
-drafted_df['STANDING REACH'] = drafted_df['STANDING REACH'].apply(convert_height_to_inches)
-drafted_df['WINGSPAN'] = drafted_df['WINGSPAN'].apply(convert_height_to_inches)
-
-numeric_cols = [
-    'BODY FAT %', 'HAND LENGTH (inches)', 'HAND WIDTH (inches)', 'WEIGHT (LBS)',
-    'Lane Agility Time', 'Shuttle Run', 'Three Quarter Sprint',
-    'Standing Vertical Leap', 'Max Vertical Leap', 'Max Bench Press'
-]
-for col in numeric_cols:
-    if col in drafted_df.columns:
-        drafted_df[col] = clean_and_convert_to_numeric(drafted_df[col])
-
-
-# --- Merge the datasets ---
-# Clean player names for a more reliable merge
+# --- Clean player names for a more reliable merge ---
 def clean_player_name(name):
     if isinstance(name, str):
         return name.lower().strip().replace('.','').replace("'",'')
     return ''
 
-drafted_df['Player_clean'] = drafted_df['Player'].apply(clean_player_name)
-injury_df['Player_clean'] = injury_df['Player'].apply(clean_player_name)
 
-# Merge on the cleaned player name
-merged_df = pd.merge(drafted_df, injury_df[['Player_clean', 'Notes']], on='Player_clean', how='left')
+def prepare_merged_data():
+    # --- 1. Load the Raw Data ---
+    # Make sure these files are in the same directory as your script
+    try:
+        drafted_df = pd.read_csv('drafted_combine_participants.csv')
+        injury_df = pd.read_csv('injury_data_2009_2023new.csv')
+        print("Files loaded successfully.")
+    except FileNotFoundError:
+        print("Error: Make sure 'drafted_combine_participants.csv' and 'injury_data_2009_2023new.csv' are in the correct directory.")
+        exit()
 
-# Save the main cleaned dataset for Tableau
-merged_df.to_csv('merged_combine_injury_data.csv', index=False)
-print("Successfully created 'merged_combine_injury_data.csv' for your Tableau dashboards.")
+    # --- 2. Clean and Prepare the Data ---
+    print("Cleaning and preparing data...")
 
+    # Clean column names by stripping whitespace
+    drafted_df.columns = drafted_df.columns.str.strip()
+    injury_df.columns = ['ID', 'Date', 'Team', 'Relinquished', 'Player', 'Notes'] # Rename injury data columns
 
-# --- 3. Run the Predictive Model to Get Feature Importance ---
-print("Running predictive model to calculate feature importances...")
+    # Apply cleaning functions
+    drafted_df['HEIGHT W/O SHOES'] = drafted_df['HEIGHT W/O SHOES'].apply(convert_height_to_inches)
+    drafted_df['HEIGHT W/ SHOES'] = drafted_df['HEIGHT W/ SHOES'].apply(convert_height_to_inches)
+    drafted_df['STANDING REACH'] = drafted_df['STANDING REACH'].apply(convert_height_to_inches)
+    drafted_df['WINGSPAN'] = drafted_df['WINGSPAN'].apply(convert_height_to_inches)
 
-# Define the features (combine metrics) and the target (Win Shares)
-features = [
-    'WINGSPAN', 'STANDING REACH', 'WEIGHT (LBS)',
-    'Standing Vertical Leap', 'Lane Agility Time', 'Three Quarter Sprint',
-    'Max Vertical Leap', 'BODY FAT %', 'Shuttle Run',
-    'Max Bench Press', 'HAND WIDTH (inches)', 'HAND LENGTH (inches)'
-]
-target = 'W' # Using 'W' for Win Shares from the dataset
+    numeric_cols = [
+        'BODY FAT %', 'HAND LENGTH (inches)', 'HAND WIDTH (inches)', 'WEIGHT (LBS)',
+        'Lane Agility Time', 'Shuttle Run', 'Three Quarter Sprint',
+        'Standing Vertical Leap', 'Max Vertical Leap', 'Max Bench Press'
+    ]
+    for col in numeric_cols:
+        if col in drafted_df.columns:
+            drafted_df[col] = clean_and_convert_to_numeric(drafted_df[col])
+
+    # --- Merge the datasets ---
+    drafted_df['Player_clean'] = drafted_df['Player'].apply(clean_player_name)
+    injury_df['Player_clean'] = injury_df['Player'].apply(clean_player_name)
+
+    # Merge on the cleaned player name
+    merged_df = pd.merge(drafted_df, injury_df[['Player_clean', 'Notes']], on='Player_clean', how='left')
+
+    return merged_df
 
-# Create a modeling dataframe, dropping rows where feature or target data is missing
-model_df = merged_df.dropna(subset=features + [target])
 
-X = model_df[features]
-y = model_df[target]
+# Seasons played per player, so it can be used as a training target
+def add_seasons_played(merged_df):
+    merged_df['Seasons_Played'] = merged_df.groupby('Player_clean')['Year'].transform('nunique')
+    return merged_df
+
+
+# --- Open the feature store, re-parsing the CSVs only when a source file changed ---
+try:
+    hashes = feature_store.source_hashes(SOURCE_FILES)
+except FileNotFoundError:
+    print("Error: Make sure 'drafted_combine_participants.csv' and 'injury_data_2009_2023new.csv' are in the correct directory.")
+    exit()
+
+# Editing any of the cleaning code also invalidates the store
+cleaning = feature_store.code_fingerprint(
+    convert_height_to_inches, clean_and_convert_to_numeric, clean_player_name,
+    prepare_merged_data, add_seasons_played
+)
+
+store = feature_store.open_store(STORE_DIR, hashes, features, targets, cleaning)
+# The Tableau export is rewritten with every re-parse, and also whenever any of its outputs
+# (including the Parquet copy once EXPORT_PARQUET=1 is switched on) is missing
+if store is None or not all(os.path.exists(p) for p in export_outputs(MERGED_EXPORT)):
+    merged_df = prepare_merged_data()
+
+    # Save the main cleaned dataset for Tableau
+    merged_file = export_table(merged_df, MERGED_EXPORT)
+    print(f"Successfully created '{merged_file}' for your Tableau dashboards.")
+
+    if store is None:
+        merged_df = add_seasons_played(merged_df)
+        if target not in merged_df.columns:
+            print(f"Error: Target column '{target}' not found in the data. Pick one of the columns in 'drafted_combine_participants.csv'.")
+            exit()
+        store_targets = feature_store.candidate_targets(merged_df, features, targets + [target])
+        store = feature_store.build_store(merged_df, features, store_targets, STORE_DIR, hashes, cleaning)
+else:
+    print(f"Sources unchanged, reusing memory-mapped features from '{STORE_DIR}/'.")
+
+
+# --- 3. Run the Predictive Model to Get Feature Importance ---
+if target not in store['targets']:
+    print(f"Error: '{target}' is not a numeric column in the data. Pick one of: {', '.join(store['targets'])}")
+    exit()
+
+print(f"Running predictive model to calculate feature importances for '{target}'...")
+
+# Drop rows where feature or target data is missing (the mapped arrays are used directly if none are)
+X, y, _ = feature_store.training_data(store, target)
+if len(y) == 0:
+    print(f"Error: No rows with both combine metrics and a numeric '{target}' value to train on.")
+    exit()
 
 # Initialize and train the Random Forest model
 # n_estimators is the number of trees in the forest
@@ -100,7 +154,7 @@ rf_model.fit(X, y)
 
 # Extract the feature importances
 importance_df = pd.DataFrame({
-    'Feature': X.columns,
+    'Feature': features,
     'Importance': rf_model.feature_importances_
 })
 
@@ -108,7 +162,8 @@ importance_df = pd.DataFrame({
 importance_df = importance_df.sort_values(by='Importance', ascending=False)
 
 # Save the feature importance data to a CSV for Tableau
-importance_df.to_csv('feature_importance.csv', index=False)
-print("Successfully created 'feature_importance.csv' for your 'Most Predictive Metrics' chart.")
+importance_file = 'feature_importance.csv' if target == 'W' else f'feature_importance_{feature_store.safe_name(target)}.csv'
+importance_file = export_table(importance_df, importance_file)
+print(f"Successfully created '{importance_file}' for your 'Most Predictive Metrics' chart.")
 print("\nHere is the raw feature importance data:\n")
 print(importance_df)
@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import re
+from export_writer import write_csv
 
 # Suppress FutureWarning
 pd.set_option('future.no_silent_downcasting', True)
@@ -74,5 +75,5 @@ if __name__ == "__main__":
                             .merge(shooting, on=["Player", "Year"], how="outer")
 
     # Output cleaned file
-    combine_cleaned.to_csv("cleaned_combine_data.csv", index=False)
+    write_csv(combine_cleaned, "cleaned_combine_data.csv")
     print("✅ Combine data cleaned and saved to cleaned_combine_data.csv")
\ No newline at end of file
@@ -5,6 +5,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import warnings
 import os
+from export_writer import write_csv
 
 # Suppress warnings for a cleaner output
 warnings.filterwarnings('ignore')
@@ -59,5 +60,5 @@ drafted_combine_players_df = combine_df[combine_df['Player_std'].isin(drafted_pl
 
 # Export the list of drafted players as requested
 output_filename = 'drafted_combine_participants.csv'
-drafted_combine_players_df.to_csv(output_filename, index=False)
+write_csv(drafted_combine_players_df, output_filename)
 print(f"Successfully filtered the list. A file named '{output_filename}' with {len(drafted_combine_players_df)} drafted players has been created.")
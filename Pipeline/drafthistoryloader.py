@@ -1,4 +1,5 @@
 import pandas as pd
+from export_writer import write_csv
 
 def load_clean_draft_history(path):
     # Read all sheets, taking row 1 as the header
@@ -20,7 +21,7 @@ def load_clean_draft_history(path):
         raise RuntimeError("No valid draft sheets found!")
 
     draft = pd.concat(parts, ignore_index=True)
-    draft.to_csv("cleaned_draft_history.csv", index=False)
+    write_csv(draft, "cleaned_draft_history.csv")
     print(f"\n🚀 Exported cleaned_draft_history.csv ({len(draft)} rows)")
     print(draft.head())
     return draft
@@ -0,0 +1,216 @@
+import os
+import shutil
+import stat
+import tempfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Rows serialized per chunk. Only a few chunks are in flight at once, so memory
+# stays bounded no matter how large the exported frame gets.
+CHUNK_ROWS = 100_000
+COMPRESS_THREADS = os.cpu_count() or 4
+
+# Export switches, read by `export_table`:
+#   EXPORT_COMPRESSION=gzip|zstd  compress Tableau CSVs (adds .gz / .zst to the file name)
+#   EXPORT_PARQUET=1              also write each export as a Parquet dataset (needs pyarrow)
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+# --- Atomic file handling ---
+
+def _temp_path_for(path):
+    """Creates an empty temp file next to `path` so the final rename stays on the same disk."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix=".tmp", dir=directory)
+    os.close(fd)
+    return tmp_path
+
+
+def _default_mode(base=0o666):
+    # os.umask can only be read by setting it, so set it back straight away
+    umask = os.umask(0)
+    os.umask(umask)
+    return base & ~umask
+
+
+def _commit(tmp_path, path):
+    """Swaps the finished temp file into place; readers only ever see the old or the new file."""
+    # mkstemp files are owner-only; keep the permissions readers of `path` already rely on
+    if os.path.exists(path):
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    else:
+        mode = _default_mode()
+    os.chmod(tmp_path, mode)
+    os.replace(tmp_path, path)
+
+
+@contextmanager
+def atomic_open(path, mode="wb"):
+    """Opens a temp file that replaces `path` only once the block finishes without error."""
+    tmp_path = _temp_path_for(path)
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        _commit(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# --- Chunk serialization ---
+
+def _csv_chunks(df, chunk_rows, index=False):
+    """Yields the frame as CSV bytes, header on the first chunk only."""
+    if df.empty:
+        yield df.to_csv(index=index).encode("utf-8")
+        return
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        yield chunk.to_csv(index=index, header=(start == 0)).encode("utf-8")
+
+
+def _gzip_member(data, level=6):
+    # Each chunk becomes a standalone gzip member; concatenated members are a valid .gz file.
+    # zlib releases the GIL, so the members compress in parallel across threads.
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _write_parallel(chunks, out, compress, threads):
+    """Compresses chunks on a thread pool, writing results in order with a bounded window."""
+    window = []
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for chunk in chunks:
+            window.append(pool.submit(compress, chunk))
+            if len(window) >= threads * 2:
+                out.write(window.pop(0).result())
+        for future in window:
+            out.write(future.result())
+
+
+# --- Public writers ---
+
+def write_csv(df, path, compression=None, index=False, chunk_rows=CHUNK_ROWS, threads=COMPRESS_THREADS):
+    """
+    Writes `df` to `path` as CSV in chunks, atomically.
+    compression: None, "gzip" or "zstd" (zstd needs the `zstandard` package).
+    """
+    if compression not in (None, "gzip", "zstd"):
+        raise ValueError(f"Unsupported compression '{compression}' (use None, 'gzip' or 'zstd')")
+
+    with atomic_open(path) as out:
+        chunks = _csv_chunks(df, chunk_rows, index=index)
+        if compression is None:
+            for chunk in chunks:
+                out.write(chunk)
+        elif compression == "gzip":
+            _write_parallel(chunks, out, _gzip_member, threads)
+        else:
+            import zstandard
+            cctx = zstandard.ZstdCompressor(level=3, threads=threads)
+            with cctx.stream_writer(out, closefd=False) as writer:
+                for chunk in chunks:
+                    writer.write(chunk)
+    return path
+
+
+def write_parquet(df, path, partition_cols=None, index=False):
+    """
+    Writes `df` as a (optionally partitioned) Parquet dataset, needs pyarrow.
+    Each write goes to a new versioned directory and `path` is a symlink that is
+    swapped over to it in one step, so readers never see a missing or half-built dataset.
+    The version it replaces is kept for readers that already resolved the old link;
+    anything older is pruned on the next write.
+    """
+    path = os.path.abspath(path)
+    parent, name = os.path.split(path)
+    if os.path.exists(path) and not os.path.islink(path):
+        raise ValueError(f"{path} exists and is not a symlink; remove it so it can be managed by write_parquet")
+
+    # mkdtemp gives every writer its own version directory, so concurrent writes can't collide
+    version_dir = tempfile.mkdtemp(prefix=f".{name}.v", dir=parent)
+    try:
+        os.chmod(version_dir, _default_mode(0o777))
+        if partition_cols:
+            df.to_parquet(version_dir, engine="pyarrow", index=index, partition_cols=partition_cols)
+        else:
+            # Unpartitioned writes need a file name, not a directory
+            df.to_parquet(os.path.join(version_dir, "part-0.parquet"), engine="pyarrow", index=index)
+    except BaseException:
+        shutil.rmtree(version_dir, ignore_errors=True)
+        raise
+
+    previous = os.path.realpath(path) if os.path.islink(path) else None
+    link_tmp = version_dir + ".link"
+    os.symlink(os.path.basename(version_dir), link_tmp)
+    os.replace(link_tmp, path)
+    if previous and previous != os.path.realpath(path):
+        _prune_versions(parent, name, keep_after=previous)
+    return path
+
+
+def _prune_versions(parent, name, keep_after):
+    """Removes version directories older than `keep_after`, the one just replaced."""
+    cutoff = os.path.getmtime(keep_after)
+    for entry in os.listdir(parent):
+        version = os.path.join(parent, entry)
+        if not entry.startswith(f".{name}.v") or entry.endswith(".link") or not os.path.isdir(version):
+            continue
+        # Directories newer than the replaced version may belong to a writer still in progress
+        if version != keep_after and os.path.getmtime(version) < cutoff:
+            shutil.rmtree(version, ignore_errors=True)
+
+
+def write_excel(df, path, **kwargs):
+    """Writes an Excel workbook atomically (xlsx can't be streamed in chunks, but it can be swapped in whole)."""
+    tmp_path = _temp_path_for(path)
+    try:
+        with pd.ExcelWriter(tmp_path, engine="openpyxl") as writer:
+            df.to_excel(writer, index=False, **kwargs)
+        _commit(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+# --- Pipeline exports ---
+
+def export_path(path, compress=True):
+    """File name `export_table` writes `path` to under the current EXPORT_COMPRESSION setting."""
+    compression = os.environ.get("EXPORT_COMPRESSION") or None
+    if not compress or compression is None:
+        return path
+    return path + COMPRESSION_SUFFIXES.get(compression, "")
+
+
+def parquet_path(path):
+    """Dataset `export_table` writes `path` to when EXPORT_PARQUET=1."""
+    return os.path.splitext(path)[0] + ".parquet"
+
+
+def export_outputs(path, compress=True):
+    """Every file `export_table` currently writes for `path`, so callers can check they all exist."""
+    outputs = [export_path(path, compress)]
+    if os.environ.get("EXPORT_PARQUET") == "1":
+        outputs.append(parquet_path(path))
+    return outputs
+
+
+def export_table(df, path, index=False, partition_cols=None, compress=True):
+    """
+    Writes a pipeline output as CSV, honouring the EXPORT_COMPRESSION and EXPORT_PARQUET switches.
+    Pass compress=False for CSVs a later script reads back by name.
+    """
+    compression = (os.environ.get("EXPORT_COMPRESSION") or None) if compress else None
+    out = write_csv(df, export_path(path, compress), compression=compression, index=index)
+    if os.environ.get("EXPORT_PARQUET") == "1":
+        write_parquet(df, parquet_path(path), partition_cols=partition_cols, index=index)
+    return out
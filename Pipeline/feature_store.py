@@ -0,0 +1,159 @@
+import hashlib
+import inspect
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from export_writer import atomic_open
+
+# Bump when the on-disk layout changes so older stores get rebuilt.
+STORE_VERSION = 2
+MANIFEST = "manifest.json"
+
+
+# --- Source fingerprints ---
+
+def file_sha256(path, block_size=1 << 20):
+    """Hashes a source file in blocks so large CSVs never load fully into memory."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_hashes(paths):
+    return {os.path.basename(p): file_sha256(p) for p in paths}
+
+
+def code_fingerprint(*funcs):
+    """Hashes the source of the cleaning functions so editing any of them invalidates the store."""
+    digest = hashlib.sha256()
+    for func in funcs:
+        digest.update(inspect.getsource(func).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _save_array(store_dir, name, arr):
+    # Write to a temp file and rename, so processes still mapping the old array keep a consistent copy
+    with atomic_open(os.path.join(store_dir, name)) as f:
+        np.save(f, arr)
+
+
+def safe_name(column):
+    """
+    Filename-safe version of a column name. Names that had to change get a short
+    hash of the original, so "PTS" and "%PTS" never map to the same file.
+    """
+    safe = re.sub(r"[^\w]+", "_", column.replace("%", "pct")).strip("_")
+    if safe == column:
+        return safe
+    return f"{safe}_{hashlib.sha1(column.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _target_file(target):
+    return "target_" + safe_name(target) + ".npy"
+
+
+def candidate_targets(df, features, targets):
+    """`targets` first, then every other numeric column, so any of them can be modelled without a rebuild."""
+    extra = [c for c in df.columns
+             if c not in features and c not in targets and pd.api.types.is_numeric_dtype(df[c])]
+    return list(dict.fromkeys(targets)) + extra
+
+
+# --- Build ---
+
+def build_store(df, features, targets, store_dir, sources, cleaning=None, player_col="Player_clean"):
+    """
+    Saves the cleaned feature matrix (float32), one vector per target and the
+    row -> player index as .npy files, plus a manifest describing them.
+    Missing values stay as NaN; `open_store` callers mask per target.
+    """
+    target_files = {t: _target_file(t) for t in targets}
+    if len(set(target_files.values())) != len(target_files):
+        raise ValueError(f"Target names map to the same file: {target_files}")
+    os.makedirs(store_dir, exist_ok=True)
+
+    # Drop the manifest first so a half-rebuilt store is never picked up as valid
+    manifest_path = os.path.join(store_dir, MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    X = df[features].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float32)
+    _save_array(store_dir, "features.npy", X)
+
+    for target in targets:
+        y = pd.to_numeric(df[target], errors="coerce").to_numpy(dtype=np.float64)
+        _save_array(store_dir, target_files[target], y)
+
+    players = df[player_col].fillna("").astype(str).to_numpy(dtype=str)
+    _save_array(store_dir, "player_index.npy", players)
+
+    manifest = {
+        "version": STORE_VERSION,
+        "n_rows": int(X.shape[0]),
+        "features": list(features),
+        "feature_dtype": str(X.dtype),
+        "targets": target_files,
+        "player_col": player_col,
+        "sources": sources,
+        "cleaning": cleaning,
+    }
+    with atomic_open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"✅ Feature store written to {store_dir}/ ({X.shape[0]} rows x {X.shape[1]} features)")
+    return open_store(store_dir, sources, features, targets, cleaning)
+
+
+# --- Open ---
+
+def open_store(store_dir, sources=None, features=None, targets=None, cleaning=None):
+    """
+    Memory-maps an existing store. Returns None when it is missing or stale
+    (different source hashes, cleaning code, feature list or layout version,
+    or any of `targets` not stored).
+    """
+    manifest_path = os.path.join(store_dir, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get("version") != STORE_VERSION:
+        return None
+    if sources is not None and manifest["sources"] != sources:
+        return None
+    if cleaning is not None and manifest.get("cleaning") != cleaning:
+        return None
+    if features is not None and manifest["features"] != list(features):
+        return None
+    if targets is not None and any(t not in manifest["targets"] for t in targets):
+        return None
+
+    def load(name):
+        return np.load(os.path.join(store_dir, name), mmap_mode="r")
+
+    return {
+        "manifest": manifest,
+        "X": load("features.npy"),
+        "targets": {t: load(fname) for t, fname in manifest["targets"].items()},
+        "players": load("player_index.npy"),
+    }
+
+
+def training_data(store, target):
+    """
+    Returns (X, y, players) restricted to rows with every feature and the target
+    present. When nothing needs dropping the mapped arrays are returned as-is.
+    """
+    if target not in store["targets"]:
+        raise KeyError(f"Target '{target}' not in feature store (have: {list(store['targets'])})")
+    X, y = store["X"], store["targets"][target]
+    mask = ~np.isnan(X).any(axis=1) & ~np.isnan(y)
+    if mask.all():
+        return X, y, store["players"]
+    return X[mask], y[mask], store["players"][mask]
@@ -1,4 +1,5 @@
 import pandas as pd
+from export_writer import export_table
 
 def extract_year(sheetname):
     return str(sheetname)[:4]
@@ -105,6 +106,7 @@ player_years = player_years.merge(inj, on=['Player_clean', 'Year_clean'], how='l
 player_years = player_years.drop_duplicates(subset=['Player_clean', 'Year_clean'])
 
 # 7. Output only combine participants and all their NBA career seasons
-player_years.to_csv("combine_participants_nba_careers.csv", index=False)
+# mergedcleaner.py reads this CSV back by name, so it is never compressed
+export_table(player_years, "combine_participants_nba_careers.csv", partition_cols=["Year_clean"], compress=False)
 print(f"✅ All combine participants with all their NBA stats/usage/injury in combine_participants_nba_careers.csv")
 print(f"Rows: {len(player_years)} | Columns: {len(player_years.columns)}")
\ No newline at end of file
@@ -1,4 +1,5 @@
 import pandas as pd
+from export_writer import write_excel
 
 # Load merged data
 df = pd.read_csv("combine_participants_nba_careers.csv")
@@ -27,5 +28,5 @@ final_cols = [col for col in player_cols + combine_cols + other_cols if col in d
 df = df[final_cols]
 
 # Save to Excel (for maximum readability and filtering in Excel/Google Sheets)
-df.to_excel("combine_participants_nba_careers_sorted.xlsx", index=False)
+write_excel(df, "combine_participants_nba_careers_sorted.xlsx")
 print("✅ Excel file sorted by player and year: combine_participants_nba_careers_sorted.xlsx")
\ No newline at end of file
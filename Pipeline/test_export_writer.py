@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+import pytest
+
+import export_writer
+
+
+def test_gzip_chunks_round_trip_with_single_header(tmp_path):
+    df = pd.DataFrame({"Player": [f"p{i}" for i in range(25)], "PTS": range(25)})
+    path = tmp_path / "out.csv.gz"
+
+    export_writer.write_csv(df, str(path), compression="gzip", chunk_rows=4, threads=3)
+
+    back = pd.read_csv(path, compression="gzip")
+    pd.testing.assert_frame_equal(back, df)
+    assert (back["Player"] == "Player").sum() == 0
+
+
+def test_empty_frame_keeps_header(tmp_path):
+    path = tmp_path / "empty.csv"
+
+    export_writer.write_csv(pd.DataFrame(columns=["Player", "PTS"]), str(path))
+
+    assert path.read_text().strip() == "Player,PTS"
+
+
+def test_failed_write_leaves_old_file_and_no_temp(tmp_path, monkeypatch):
+    path = tmp_path / "out.csv"
+    path.write_text("old\n")
+
+    def broken_chunks(df, chunk_rows, index=False):
+        yield b"Player,PTS\n"
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(export_writer, "_csv_chunks", broken_chunks)
+    with pytest.raises(RuntimeError):
+        export_writer.write_csv(pd.DataFrame({"Player": ["a"], "PTS": [1]}), str(path))
+
+    assert path.read_text() == "old\n"
+    assert os.listdir(tmp_path) == ["out.csv"]
+
+
+def test_replacing_file_keeps_its_permissions(tmp_path):
+    path = tmp_path / "out.csv"
+    path.write_text("old\n")
+    os.chmod(path, 0o644)
+
+    export_writer.write_csv(pd.DataFrame({"PTS": [1]}), str(path))
+
+    assert os.stat(path).st_mode & 0o777 == 0o644
+
+
+@pytest.mark.parametrize("partition_cols", [None, ["Year"]])
+def test_parquet_round_trip(tmp_path, partition_cols):
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"Player": ["a", "b", "c"], "Year": [2010, 2010, 2011], "PTS": [1.0, 2.0, 3.0]})
+    path = tmp_path / "out.parquet"
+
+    export_writer.write_parquet(df, str(path), partition_cols=partition_cols)
+
+    back = pd.read_parquet(path).sort_values("Player").reset_index(drop=True)
+    assert sorted(back.columns) == sorted(df.columns)
+    assert back["PTS"].tolist() == [1.0, 2.0, 3.0]
+    assert back["Year"].astype(int).tolist() == [2010, 2010, 2011]
+
+
+def test_parquet_keeps_previous_version_and_prunes_older(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "out.parquet"
+
+    versions = []
+    for i in range(3):
+        export_writer.write_parquet(pd.DataFrame({"PTS": [float(i)]}), str(path))
+        versions.append(os.path.realpath(path))
+        # mtime resolution on some filesystems is coarse; keep the versions ordered
+        os.utime(versions[-1], (i, i))
+
+    assert not os.path.exists(versions[0])
+    assert os.path.isdir(versions[1])
+    assert pd.read_parquet(path)["PTS"].tolist() == [2.0]
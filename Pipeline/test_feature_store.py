@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+import feature_store
+
+FEATURES = ["WINGSPAN", "Max Vertical Leap"]
+SOURCES = {"drafted_combine_participants.csv": "abc"}
+
+
+def _frame():
+    return pd.DataFrame({
+        "Player_clean": ["a", "b", "c"],
+        "WINGSPAN": [80.0, np.nan, 82.0],
+        "Max Vertical Leap": [35.0, 36.0, 37.0],
+        "PTS": [10.0, 12.0, np.nan],
+        "%PTS": [20.0, 25.0, 30.0],
+    })
+
+
+def test_build_then_open_round_trips(tmp_path):
+    df = _frame()
+    feature_store.build_store(df, FEATURES, ["PTS"], str(tmp_path), SOURCES, cleaning="v1")
+
+    store = feature_store.open_store(str(tmp_path), SOURCES, FEATURES, ["PTS"], "v1")
+
+    np.testing.assert_array_equal(store["X"], df[FEATURES].to_numpy(dtype=np.float32))
+    np.testing.assert_array_equal(store["targets"]["PTS"], df["PTS"].to_numpy())
+    assert list(store["players"]) == ["a", "b", "c"]
+
+
+def test_open_store_detects_stale_inputs(tmp_path):
+    feature_store.build_store(_frame(), FEATURES, ["PTS"], str(tmp_path), SOURCES, cleaning="v1")
+
+    assert feature_store.open_store(str(tmp_path), {"drafted_combine_participants.csv": "def"}, FEATURES) is None
+    assert feature_store.open_store(str(tmp_path), SOURCES, ["WINGSPAN"]) is None
+    assert feature_store.open_store(str(tmp_path), SOURCES, FEATURES, cleaning="v2") is None
+    assert feature_store.open_store(str(tmp_path), SOURCES, FEATURES, ["%PTS"]) is None
+    assert feature_store.open_store(str(tmp_path), SOURCES, FEATURES, ["PTS"], "v1") is not None
+
+
+def test_training_data_masks_nan_rows_per_target(tmp_path):
+    store = feature_store.build_store(_frame(), FEATURES, ["PTS", "%PTS"], str(tmp_path), SOURCES)
+
+    _, y, players = feature_store.training_data(store, "PTS")
+    assert list(players) == ["a"] and list(y) == [10.0]
+
+    _, y, players = feature_store.training_data(store, "%PTS")
+    assert list(players) == ["a", "c"] and list(y) == [20.0, 30.0]
+
+
+def test_similar_target_names_get_separate_files(tmp_path):
+    df = _frame()
+    store = feature_store.build_store(df, FEATURES, ["PTS", "%PTS"], str(tmp_path), SOURCES)
+
+    files = store["manifest"]["targets"]
+    assert files["PTS"] != files["%PTS"]
+    np.testing.assert_array_equal(store["targets"]["PTS"], df["PTS"].to_numpy())
+    np.testing.assert_array_equal(store["targets"]["%PTS"], df["%PTS"].to_numpy())
+    assert feature_store.safe_name("Plus/Minus") != feature_store.safe_name("Plus_Minus")
+    assert "/" not in feature_store.safe_name("Plus/Minus")